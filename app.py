@@ -2,7 +2,8 @@
 # -*- coding: utf-8 -*-
 import streamlit as st
 import base64
-from src.data_handler import load_data
+from src.data_handler import load_data, resolve_excel_path
+from src.pdf_report import create_result_pdf
 from src.quiz_logic import calculate_score, sections_to_improve
 from src.ui_builder import display_instructions, build_quiz_form, show_result
 
@@ -181,6 +182,86 @@ header {visibility: hidden;}
   font-weight: 600;
 }
 
+/* Preguntas del cuestionario */
+.q-section {
+  display: inline-block;
+  font-size: 0.9rem;
+  color: #6b7280;
+  background: linear-gradient(135deg, #f3f4f6 0%, #e5e7eb 100%);
+  border: 1px solid #d1d5db;
+  padding: 0.4rem 0.8rem;
+  border-radius: 8px;
+  margin: 0 0 0.75rem 0;
+  font-weight: 600;
+}
+
+.q-text {
+  font-size: clamp(1.1rem, 2.5vw, 1.4rem);
+  line-height: 1.6;
+  color: #111827;
+  background-color: #ffffff;
+  margin: 0.5rem 0 1rem 0;
+  font-weight: 700;
+  padding: 0.5rem 0;
+}
+
+.q-text .q-id {
+  color: #667eea;
+  font-weight: 800;
+}
+
+.q-divider {
+  height: 1.5rem;
+  border-bottom: 1px solid #e5e7eb;
+  margin: 1rem 0;
+}
+
+/* Barra de progreso sticky con colores de la bandera LGBTI */
+.quiz-progress {
+  position: fixed;
+  bottom: 0;
+  left: 0;
+  right: 0;
+  background: linear-gradient(to top, #ffffff 0%, rgba(255,255,255,0.98) 100%);
+  padding: clamp(0.75rem, 2vw, 1.25rem);
+  border-top: 2px solid #e5e7eb;
+  box-shadow: 0 -4px 16px rgba(0,0,0,0.1);
+  z-index: 999;
+  backdrop-filter: blur(10px);
+}
+
+.quiz-progress-inner {
+  max-width: 1200px;
+  margin: 0 auto;
+}
+
+.quiz-progress-track {
+  height: 14px;
+  background-color: #e5e7eb;
+  border-radius: 999px;
+  overflow: hidden;
+  box-shadow: inset 0 2px 4px rgba(0,0,0,0.1);
+}
+
+.quiz-progress-fill {
+  height: 100%;
+  background: linear-gradient(to right, #E40303 0%, #FF8C00 16.67%, #FFED00 33.33%, #008026 50%, #24408E 66.67%, #732982 83.33%, #732982 100%);
+  transition: width 0.4s cubic-bezier(0.4, 0.0, 0.2, 1);
+  box-shadow: 0 0 12px rgba(0,0,0,0.15);
+}
+
+.quiz-progress-label {
+  margin-top: 0.5rem;
+  color: #374151;
+  font-size: clamp(0.85rem, 2vw, 1rem);
+  text-align: center;
+  font-weight: 600;
+}
+
+.quiz-progress-spacer {
+  height: clamp(70px, 15vw, 90px);
+}
+
 /* Expanders mejorados */
 .streamlit-expanderHeader {
   font-size: 1.1rem !important;
@@ -352,9 +433,15 @@ header {visibility: hidden;}
 
 
 @st.cache_data(show_spinner="Cargando datos del Excel...")
-def load_cached_data():
-    """Carga datos con caché para evitar recargas."""
-    return load_data("data")
+def load_cached_data(data_dir: str, excel_mtime: float):
+    """Carga datos con caché; el mtime del Excel invalida la caché si cambia."""
+    return load_data(data_dir)
+
+
+def get_data(data_dir: str = "data"):
+    """Resuelve el Excel y devuelve sus datos desde la caché de Streamlit."""
+    xlsx = resolve_excel_path(data_dir)
+    return load_cached_data(data_dir, xlsx.stat().st_mtime)
 
 
 def main():
@@ -395,7 +482,7 @@ def main():
     )
 
     # Carga con caché
-    data = load_cached_data()
+    data = get_data("data")
 
     # Mostrar tiempos de carga (opcional, solo en debug)
     if "_load_timings" in data and st.sidebar.checkbox("Modo debug", value=False):
@@ -416,7 +503,8 @@ def main():
     with st.expander("Ver instrucciones", expanded=True):
         display_instructions(instructions)
 
-    # Formulario
+    # Formulario (sin st.form: la barra de progreso se actualiza con cada
+    # respuesta; los reruns no re-parsean el Excel gracias a la caché)
     st.markdown("---")
     answers, labels = build_quiz_form(questions)
 
@@ -446,77 +534,6 @@ def main():
             show_result(res, levels, recommendations, areas)
 
             # Generación de PDF
-            from io import BytesIO
-            from reportlab.lib.pagesizes import LETTER
-            from reportlab.lib.units import inch
-            from reportlab.lib.styles import getSampleStyleSheet
-            from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
-
-            def create_result_pdf(result, levels, areas_dict) -> bytes:
-                buf = BytesIO()
-                doc = SimpleDocTemplate(
-                    buf,
-                    pagesize=LETTER,
-                    leftMargin=0.8 * inch,
-                    rightMargin=0.8 * inch,
-                    topMargin=0.8 * inch,
-                    bottomMargin=0.8 * inch,
-                )
-                styles = getSampleStyleSheet()
-                story = []
-
-                story.append(
-                    Paragraph(
-                        "<b>Autodiagnóstico en inclusión laboral LGBTIQ+</b>",
-                        styles["Title"],
-                    )
-                )
-                story.append(Spacer(1, 10))
-                story.append(
-                    Paragraph(
-                        f"<b>Resultado:</b> {result['level_label']} &nbsp;&nbsp; "
-                        f"<b>Puntaje total:</b> {int(result['total'])}",
-                        styles["Normal"],
-                    )
-                )
-                story.append(Spacer(1, 14))
-
-                lv = levels.get(result["level_key"], {})
-
-                def sec(titulo: str, contenido: str):
-                    story.append(Paragraph(f"<b>{titulo}</b>", styles["Heading2"]))
-                    story.append(Spacer(1, 4))
-                    story.append(
-                        Paragraph(
-                            (contenido or "(sin contenido)").replace("\n", "<br/>"),
-                            styles["Normal"],
-                        )
-                    )
-                    story.append(Spacer(1, 10))
-
-                sec("Definición", lv.get("DEFINICION"))
-                sec("Características", lv.get("CARACTERISTICAS"))
-                sec("Ruta de aprendizaje", lv.get("RUTA"))
-
-                if areas_dict:
-                    story.append(
-                        Paragraph("<b>Áreas a fortalecer</b>", styles["Heading2"])
-                    )
-                    story.append(Spacer(1, 4))
-                    for sec_name, sc in areas_dict.items():
-                        story.append(
-                            Paragraph(
-                                f"• {sec_name} (puntaje ≤ {int(sc)})",
-                                styles["Normal"],
-                            )
-                        )
-                    story.append(Spacer(1, 10))
-
-                doc.build(story)
-                pdf = buf.getvalue()
-                buf.close()
-                return pdf
-
             pdf_bytes = create_result_pdf(res, levels, areas)
 
             # Botón de descarga centrado
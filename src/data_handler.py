@@ -5,31 +5,108 @@ Carga y parseo del Excel original:
 - Instrucciones (sheet 'Instrucciones')
 - Cuestionario (sheet 'Cuestionario'): preguntas A..J con opciones 3/2/1
 - Niveles (sheets 'Nivel 1','Nivel 2','Nivel 3'): NIVEL, DEFINICION, CARACTERISTICAS, RUTA
-- Recomendaciones (sheet 'Recomendaciones')
+- Recomendaciones (sheet 'Recomendaciones'), solo si LOAD_RECOMMENDATIONS
 - Umbrales desde la fórmula en 'Cuestionario'!C81 si existe (fallback a 15/23)
+
+Los valores se leen con python-calamine (un solo workbook para todas las
+hojas); si no está instalado se usa openpyxl. La fórmula de umbrales siempre
+se lee con openpyxl, porque calamine solo expone valores.
+
+load_data guarda el resultado parseado en 'data/.cache/<hash>.pkl' (hash del
+contenido del Excel); AUTODIAG_NO_CACHE=1 desactiva esa caché en disco.
 """
 
 from __future__ import annotations
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import TYPE_CHECKING, Dict, Any, Iterator, List, Optional
+import hashlib
+import html
+import logging
+import os
+import pickle
 import re
 import unicodedata
 
-import pandas as pd
 from openpyxl import load_workbook
 
+if TYPE_CHECKING:  # pandas solo se importa si se lee una hoja como DataFrame
+    import pandas as pd
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:  # calamine es opcional: se recurre a openpyxl
+    CalamineWorkbook = None
+
 # Nombre EXACTO del archivo esperado
 EXCEL_FILENAME = "Cuestionario de autodiagnóstico en inclusión laboral LGBTIQ para agencias de empleo.xlsx"
 
+logger = logging.getLogger(__name__)
+
 DEFAULT_THRESHOLDS = {"nivel_1_max": 15, "nivel_2_max": 23}
 
+# El cuestionario tiene 10 preguntas (A..J); la lectura se corta al completarlas
+MAX_QUESTIONS = 10
+
+CACHE_DIRNAME = ".cache"
+# Súbelo cuando cambie la estructura del dict devuelto por load_data_from_excel
+CACHE_VERSION = 3
+
+# La UI no muestra la hoja 'Recomendaciones'; se deja de leer mientras sea así
+LOAD_RECOMMENDATIONS = False
+
+EXCEL_ENGINE = "calamine" if CalamineWorkbook is not None else "openpyxl"
+
+# Partes del xlsx que la app no usa: openpyxl se salta su parseo
+_OPENPYXL_SKIP = {"keep_vba": False, "keep_links": False, "rich_text": False}
+
+# Comparaciones contra el total (D77) dentro de la fórmula de C81
+_THRESH_RE = re.compile(r"D77\s*([<>=]{1,2})\s*(\d+)")
+# Quita tildes y eñes y cambia espacios por "_" en los encabezados de 'Recomendaciones'
+_ACCENT_TBL = str.maketrans(
+    {"á": "a", "é": "e", "í": "i", "ó": "o", "ú": "u", "ñ": "n", " ": "_"}
+)
+
 
 def _norm_text(x: Any) -> str:
+    # calamine devuelve los números como float (3 -> 3.0)
+    if isinstance(x, float) and x.is_integer():
+        x = int(x)
     return str(x).strip() if x is not None else ""
 
 
+def _open_workbook(xlsx: Path) -> Any:
+    if CalamineWorkbook is not None:
+        return CalamineWorkbook.from_path(str(xlsx))
+    return load_workbook(xlsx, data_only=True, read_only=True, **_OPENPYXL_SKIP)
+
+
+def _sheet_rows(wb: Any, sheet: str) -> Iterator[tuple]:
+    """Filas de valores de la hoja desde A1, perezosas y sin importar el motor."""
+    if CalamineWorkbook is not None and isinstance(wb, CalamineWorkbook):
+        ws = wb.get_sheet_by_name(sheet)
+        if ws.start is None:  # hoja vacía
+            return
+        # calamine itera desde la primera celda usada; se reubica en A1
+        first_row, first_col = ws.start
+        pad = ("",) * first_col
+        for _ in range(first_row):
+            yield ()
+        for r in ws.iter_rows():
+            yield pad + tuple(r)
+        return
+    yield from wb[sheet].iter_rows(values_only=True)
+
+
+def _sheet_names(wb: Any) -> List[str]:
+    if CalamineWorkbook is not None and isinstance(wb, CalamineWorkbook):
+        return wb.sheet_names
+    return wb.sheetnames
+
+
 def _sheet_to_dataframe(path: Path, sheet: str) -> pd.DataFrame:
-    df = pd.read_excel(path, sheet_name=sheet, dtype=str, engine="openpyxl")
+    import pandas as pd
+
+    df = pd.read_excel(path, sheet_name=sheet, dtype=str, engine=EXCEL_ENGINE)
     df = df.dropna(how="all").dropna(axis=1, how="all").fillna("")
     return df
 
@@ -63,20 +140,10 @@ def _find_excel_path(data_dir: Path) -> Optional[Path]:
 # ---------------- Instrucciones ----------------
 
 
-def _load_instructions_from_excel(xlsx: Path) -> str:
-    df = _sheet_to_dataframe(xlsx, "Instrucciones")
-    parts: List[str] = []
-    for _, row in df.iterrows():
-        for v in row.tolist():
-            sv = _norm_text(v)
-            if sv:
-                parts.append(sv)
+def _load_instructions_from_excel(wb: Any) -> str:
+    parts = (_norm_text(v) for row in _sheet_rows(wb, "Instrucciones") for v in row)
     # Quita repeticiones triviales preservando orden
-    seen, uniq = set(), []
-    for p in parts:
-        if p not in seen:
-            uniq.append(p)
-            seen.add(p)
+    uniq = list(dict.fromkeys(p for p in parts if p))
     return (
         "\n".join(uniq)
         if uniq
@@ -87,21 +154,63 @@ def _load_instructions_from_excel(xlsx: Path) -> str:
 # ---------------- Cuestionario ----------------
 
 
-def _load_questions_from_excel(xlsx: Path) -> List[Dict[str, Any]]:
-    wb = load_workbook(xlsx, data_only=False, read_only=True)
-    if "Cuestionario" not in wb.sheetnames:
-        raise FileNotFoundError("La hoja 'Cuestionario' no existe en el Excel.")
-    ws = wb["Cuestionario"]
+def _option_score(val: Any) -> Optional[int]:
+    # Solo enteros (calamine los entrega como 3.0); un 2.5 no es una opción válida
+    if isinstance(val, (int, float)) or (isinstance(val, str) and val.isdigit()):
+        f = float(val)
+        return int(f) if f.is_integer() else None
+    return None
+
+
+def _build_question(
+    qid: str, qtext: str, section: str, options: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    # Asegura orden 3-2-1 y completa si faltan
+    options = sorted(options, key=lambda x: x["score"], reverse=True)
+    if len(options) != 3:
+        missing = {3, 2, 1} - {o["score"] for o in options}
+        for s in sorted(missing, reverse=True):
+            options.append({"score": s, "label": f"Opción {s}"})
+        options = sorted(options, key=lambda x: x["score"], reverse=True)
+
+    # Versiones escapadas para la UI (unsafe_allow_html), calculadas una vez
+    for o in options:
+        o["label_html"] = html.escape(o["label"], quote=True)
+    return {
+        "id": qid,
+        "section": section,
+        "text": qtext,
+        "options": options,
+        "id_html": html.escape(qid, quote=True),
+        "section_html": html.escape(section, quote=True),
+        "text_html": html.escape(qtext, quote=True),
+    }
 
-    def cell(col: str, r: int):
-        return ws[f"{col}{r}"].value
+
+def _load_questions_from_excel(wb: Any) -> List[Dict[str, Any]]:
+    if "Cuestionario" not in _sheet_names(wb):
+        raise FileNotFoundError("La hoja 'Cuestionario' no existe en el Excel.")
+    # Columnas B (ID/puntaje) y C (texto), rellenas si la hoja es angosta
+    rows = (
+        (tuple(r) + (None,) * 3)[1:3] for r in _sheet_rows(wb, "Cuestionario")
+    )
 
     questions: List[Dict[str, Any]] = []
     current_section: Optional[str] = None
-    row, max_row = 1, ws.max_row
-
-    while row <= max_row:
-        b, c, d = cell("B", row), cell("C", row), cell("D", row)
+    # Pregunta cuyas opciones se están leyendo: (id, texto, sección, opciones)
+    pending: Optional[tuple] = None
+
+    for b, c in rows:
+        if pending is not None:
+            # Opciones tras la pregunta: B ∈ {3,2,1}, C = texto
+            score = _option_score(b)
+            if score in (3, 2, 1) and _norm_text(c):
+                pending[3].append({"score": score, "label": _norm_text(c)})
+                continue
+            questions.append(_build_question(*pending))
+            pending = None
+            if len(questions) == MAX_QUESTIONS:
+                break
 
         # Encabezado de sección (texto en B, C vacío o no-pregunta)
         if (
@@ -115,42 +224,10 @@ def _load_questions_from_excel(xlsx: Path) -> List[Dict[str, Any]]:
 
         # Fila de pregunta (ID en B, pregunta en C)
         if _is_question_id(b) and _looks_like_question(c):
-            qid = _norm_text(b)
-            qtext = _norm_text(c)
-            # Lee 3 opciones siguientes: B ∈ {3,2,1}, C = texto
-            options: List[Dict[str, Any]] = []
-            r2 = row + 1
-            while r2 <= max_row:
-                b2, c2 = cell("B", r2), cell("C", r2)
-                if isinstance(b2, (int, float)) or (
-                    isinstance(b2, str) and b2.isdigit()
-                ):
-                    score = int(str(b2))
-                    if score in (3, 2, 1) and _norm_text(c2):
-                        options.append({"score": score, "label": _norm_text(c2)})
-                        r2 += 1
-                        continue
-                break
-            # Asegura orden 3-2-1 y completa si faltan
-            options = sorted(options, key=lambda x: x["score"], reverse=True)
-            if len(options) != 3:
-                missing = {3, 2, 1} - {o["score"] for o in options}
-                for s in sorted(missing, reverse=True):
-                    options.append({"score": s, "label": f"Opción {s}"})
-                options = sorted(options, key=lambda x: x["score"], reverse=True)
-
-            questions.append(
-                {
-                    "id": qid,
-                    "section": current_section or "",
-                    "text": qtext,
-                    "options": options,
-                }
-            )
-            row = r2
-            continue
+            pending = (_norm_text(b), _norm_text(c), current_section or "", [])
 
-        row += 1
+    if pending is not None:
+        questions.append(_build_question(*pending))
 
     if not questions:
         raise ValueError(
@@ -162,14 +239,13 @@ def _load_questions_from_excel(xlsx: Path) -> List[Dict[str, Any]]:
 # ---------------- Umbrales desde fórmula C81 ----------------
 
 
-def _extract_thresholds_from_formula(xlsx: Path) -> Dict[str, int]:
+def _extract_thresholds_from_formula(wb_formula: Any) -> Dict[str, int]:
     try:
-        wb = load_workbook(xlsx, data_only=False, read_only=False)
-        ws = wb["Cuestionario"]
+        ws = wb_formula["Cuestionario"]
         f = ws["C81"].value
         if not isinstance(f, str) or "IF(" not in f.upper():
             return DEFAULT_THRESHOLDS.copy()
-        comps = re.findall(r"D77\s*([<>=]{1,2})\s*(\d+)", f)
+        comps = _THRESH_RE.findall(f)
         nums = sorted({int(n) for (_op, n) in comps if n.isdigit()})
         if len(nums) >= 2:
             return {"nivel_1_max": nums[0], "nivel_2_max": nums[1]}
@@ -185,57 +261,43 @@ def _extract_thresholds_from_formula(xlsx: Path) -> Dict[str, int]:
 
 # ---------------- Niveles ----------------
 
+# Rótulo de la hoja de nivel -> clave en el dict del nivel
+_LEVEL_KEYS = {
+    "NIVEL": "NIVEL",
+    "DEFINICION": "DEFINICION",
+    "DEFINICIÓN": "DEFINICION",
+    "CARACTERISTICAS": "CARACTERISTICAS",
+    "CARACTERÍSTICAS": "CARACTERISTICAS",
+    "RUTA": "RUTA",
+    "RUTA DE APRENDIZAJE SUGERIDA": "RUTA",
+    "RUTA_DE_APRENDIZAJE_SUGERIDA": "RUTA",
+}
+
 
-def _load_single_level_sheet(xlsx: Path, sheet_name: str) -> Dict[str, str]:
-    wb = load_workbook(xlsx, data_only=True, read_only=True)
-    ws = wb[sheet_name]
+def _load_single_level_sheet(wb: Any, sheet_name: str) -> Dict[str, str]:
     out: Dict[str, str] = {}
-    for row in ws.iter_rows():
-        cells = [c for c in row if c.value not in (None, "")]
+    for row in _sheet_rows(wb, sheet_name):
+        cells = [v for v in row if v not in (None, "")]
         if len(cells) < 2:
             continue
-        left = str(cells[0].value).strip().upper()
-        right = str(cells[1].value).strip()
-        mapping = {
-            "NIVEL": "NIVEL",
-            "DEFINICION": "DEFINICION",
-            "DEFINICIÓN": "DEFINICION",
-            "CARACTERISTICAS": "CARACTERISTICAS",
-            "CARACTERÍSTICAS": "CARACTERISTICAS",
-            "RUTA": "RUTA",
-            "RUTA DE APRENDIZAJE SUGERIDA": "RUTA",
-            "RUTA_DE_APRENDIZAJE_SUGERIDA": "RUTA",
-        }
-        key = mapping.get(left)
+        left = _norm_text(cells[0]).upper()
+        right = _norm_text(cells[1])
+        key = _LEVEL_KEYS.get(left)
         if key and right:
             out[key] = f"{out[key]}\n{right}" if key in out else right
     if not out:
-        df = _sheet_to_dataframe(xlsx, sheet_name)
-        for col in df.columns:
-            cu = str(col).strip().upper()
-            if cu in [
-                "NIVEL",
-                "DEFINICION",
-                "DEFINICIÓN",
-                "CARACTERISTICAS",
-                "CARACTERÍSTICAS",
-                "RUTA",
-                "RUTA_DE_APRENDIZAJE_SUGERIDA",
-            ]:
-                text = "\n".join(
-                    [_norm_text(x) for x in df[col].tolist() if _norm_text(x)]
-                )
-                cu = "DEFINICION" if cu == "DEFINICIÓN" else cu
-                cu = "CARACTERISTICAS" if cu == "CARACTERÍSTICAS" else cu
-                out[cu] = text
+        logger.warning(
+            "La hoja '%s' no tiene rótulos de nivel reconocibles.",
+            sheet_name,
+        )
     return out
 
 
-def _load_levels_from_excel(xlsx: Path) -> Dict[str, Dict[str, str]]:
+def _load_levels_from_excel(wb: Any) -> Dict[str, Dict[str, str]]:
     out = {}
     for sn in ["Nivel 1", "Nivel 2", "Nivel 3"]:
         try:
-            out[sn] = _load_single_level_sheet(xlsx, sn)
+            out[sn] = _load_single_level_sheet(wb, sn)
         except Exception:
             out[sn] = {}
     return out
@@ -245,20 +307,7 @@ def _load_levels_from_excel(xlsx: Path) -> Dict[str, Dict[str, str]]:
 
 
 def _normalize_rec_columns(cols: List[str]) -> List[str]:
-    normed = []
-    for c in cols:
-        s = _norm_text(c).lower()
-        s = (
-            s.replace("á", "a")
-            .replace("é", "e")
-            .replace("í", "i")
-            .replace("ó", "o")
-            .replace("ú", "u")
-            .replace("ñ", "n")
-        )
-        s = s.replace(" ", "_")
-        normed.append(s)
-    return normed
+    return [_norm_text(c).lower().translate(_ACCENT_TBL) for c in cols]
 
 
 def _load_recommendations_from_excel(xlsx: Path) -> pd.DataFrame:
@@ -288,11 +337,23 @@ def load_data_from_excel(excel_path: str | Path) -> Dict[str, Any]:
     xlsx = Path(excel_path)
     if not xlsx.exists():
         raise FileNotFoundError(f"No encontré el Excel en: {xlsx}")
-    instructions = _load_instructions_from_excel(xlsx)
-    questions = _load_questions_from_excel(xlsx)
-    thresholds = _extract_thresholds_from_formula(xlsx)
-    levels = _load_levels_from_excel(xlsx)
-    recs = _load_recommendations_from_excel(xlsx)
+    # Cada workbook se abre una sola vez y se comparte entre los loaders
+    # (try anidados: si falla la segunda apertura, la primera igual se cierra)
+    wb = _open_workbook(xlsx)
+    try:
+        wb_formula = load_workbook(
+            xlsx, data_only=False, read_only=True, **_OPENPYXL_SKIP
+        )
+        try:
+            instructions = _load_instructions_from_excel(wb)
+            questions = _load_questions_from_excel(wb)
+            thresholds = _extract_thresholds_from_formula(wb_formula)
+            levels = _load_levels_from_excel(wb)
+        finally:
+            wb_formula.close()
+    finally:
+        wb.close()
+    recs = _load_recommendations_from_excel(xlsx) if LOAD_RECOMMENDATIONS else None
     return {
         "instructions": instructions,
         "questions": questions,
@@ -302,7 +363,7 @@ def load_data_from_excel(excel_path: str | Path) -> Dict[str, Any]:
     }
 
 
-def load_data(data_dir: str | Path = "data") -> Dict[str, Any]:
+def resolve_excel_path(data_dir: str | Path = "data") -> Path:
     d = Path(data_dir)
     xlsx = _find_excel_path(d)
     if not xlsx:
@@ -310,4 +371,42 @@ def load_data(data_dir: str | Path = "data") -> Dict[str, Any]:
             f"No encontré el Excel '{EXCEL_FILENAME}' en {d}. "
             "Súbelo con el uploader o colócalo en la carpeta 'data/'."
         )
-    return load_data_from_excel(xlsx)
+    return xlsx
+
+
+def _disk_cache_enabled() -> bool:
+    return os.environ.get("AUTODIAG_NO_CACHE", "").strip() in ("", "0")
+
+
+def _cache_file_for(xlsx: Path) -> Path:
+    h = hashlib.blake2b(xlsx.read_bytes(), digest_size=16)
+    h.update(f"v{CACHE_VERSION}".encode())
+    return xlsx.parent / CACHE_DIRNAME / f"{h.hexdigest()}.pkl"
+
+
+def load_data(data_dir: str | Path = "data") -> Dict[str, Any]:
+    xlsx = resolve_excel_path(data_dir)
+    if not _disk_cache_enabled():
+        return load_data_from_excel(xlsx)
+
+    cache_file = _cache_file_for(xlsx)
+    if cache_file.exists():
+        try:
+            with cache_file.open("rb") as fh:
+                return pickle.load(fh)
+        except Exception:
+            pass  # caché corrupta o ilegible: se vuelve a parsear el Excel
+
+    data = load_data_from_excel(xlsx)
+    try:
+        cache_file.parent.mkdir(exist_ok=True)
+        # Solo se conserva la caché del Excel vigente
+        for old in cache_file.parent.glob("*.pkl"):
+            old.unlink()
+        tmp = cache_file.with_suffix(".tmp")
+        with tmp.open("wb") as fh:
+            pickle.dump(data, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache_file)
+    except OSError:
+        pass  # p. ej. sistema de archivos de solo lectura: se sigue sin caché
+    return data
@@ -0,0 +1,97 @@
+# src/pdf_report.py
+# -*- coding: utf-8 -*-
+"""
+PDF descargable con el resultado del autodiagnóstico (ReportLab).
+"""
+
+from __future__ import annotations
+from functools import lru_cache
+from io import BytesIO
+import html
+
+PDF_MARGIN_INCHES = 0.8
+
+
+# ReportLab se importa al generar el primer PDF, no en el arranque de la app.
+# La caché vive en este módulo (persistente en sys.modules), no en app.py:
+# Streamlit re-ejecuta app.py en un __main__ nuevo en cada rerun.
+@lru_cache(maxsize=1)
+def _get_pdf_styles():
+    """Hoja de estilos del PDF, construida en el primer PDF del proceso."""
+    from reportlab.lib.styles import getSampleStyleSheet
+
+    return getSampleStyleSheet()
+
+
+def create_result_pdf(result, levels, areas_dict) -> bytes:
+    """Genera el PDF del resultado y devuelve sus bytes."""
+    from reportlab.lib.pagesizes import LETTER
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
+    styles = _get_pdf_styles()
+    title_style = styles["Title"]
+    heading_style = styles["Heading2"]
+    normal_style = styles["Normal"]
+    margin = PDF_MARGIN_INCHES * inch
+
+    buf = BytesIO()
+    doc = SimpleDocTemplate(
+        buf,
+        pagesize=LETTER,
+        leftMargin=margin,
+        rightMargin=margin,
+        topMargin=margin,
+        bottomMargin=margin,
+    )
+    story = []
+
+    story.append(
+        Paragraph("<b>Autodiagnóstico en inclusión laboral LGBTIQ+</b>", title_style)
+    )
+    story.append(Spacer(1, 10))
+    story.append(
+        Paragraph(
+            f"<b>Resultado:</b> {result['level_label']} &nbsp;&nbsp; "
+            f"<b>Puntaje total:</b> {int(result['total'])}",
+            normal_style,
+        )
+    )
+    story.append(Spacer(1, 14))
+
+    lv = levels.get(result["level_key"], {})
+
+    def sec(titulo: str, contenido: str):
+        story.append(Paragraph(f"<b>{titulo}</b>", heading_style))
+        story.append(Spacer(1, 4))
+        story.append(
+            Paragraph(
+                (contenido or "(sin contenido)").replace("\n", "<br/>"),
+                normal_style,
+            )
+        )
+        story.append(Spacer(1, 10))
+
+    sec("Definición", lv.get("DEFINICION"))
+    sec("Características", lv.get("CARACTERISTICAS"))
+    sec("Ruta de aprendizaje", lv.get("RUTA"))
+
+    if areas_dict:
+        story.append(Paragraph("<b>Áreas a fortalecer</b>", heading_style))
+        story.append(Spacer(1, 4))
+        # Un solo párrafo para toda la lista
+        story.append(
+            Paragraph(
+                "<br/>".join(
+                    f"• {html.escape(sec_name, quote=True)} (puntaje ≤ {int(sc)})"
+                    for sec_name, sc in areas_dict.items()
+                ),
+                normal_style,
+            )
+        )
+        story.append(Spacer(1, 10))
+
+    doc.build(story)
+    pdf = buf.getvalue()
+    buf.close()
+    return pdf
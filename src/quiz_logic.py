@@ -34,13 +34,13 @@ def sections_to_improve(
     """
     Identifica secciones con respuestas <= 2, para orientar recomendaciones.
     Retorna {seccion: puntaje_min_detectado}
+    Son ~10 enteros: Python puro es más rápido que cualquier JIT para este tamaño.
     """
     id_to_section = {q["id"]: q.get("section", "") for q in questions}
     secc_low: Dict[str, int] = {}
     for qid, score in answers.items():
-        sec = id_to_section.get(qid, "General")
         s = int(score)
         if s <= 2:
-            prev = secc_low.get(sec, 3)
-            secc_low[sec] = min(prev, s)
+            sec = id_to_section.get(qid, "General")
+            secc_low[sec] = min(secc_low.get(sec, 3), s)
     return secc_low
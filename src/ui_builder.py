@@ -1,17 +1,35 @@
 # src/ui_builder.py
 # -*- coding: utf-8 -*-
 from __future__ import annotations
-from typing import Dict, Any, List, Tuple
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
 import streamlit as st
-import pandas as pd
 import html
+from functools import lru_cache
 from uuid import uuid4
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Plantillas estáticas: los estilos viven en el <style> global de app.py
+_SECTION_TMPL = '<div class="q-section">{}</div>'
+_QUESTION_TMPL = '<div class="q-text"><span class="q-id">{}.</span> {}</div>'
+_DIVIDER_HTML = '<div class="q-divider"></div>'
+_FOOTER_TMPL = (
+    '<div class="quiz-progress"><div class="quiz-progress-inner">'
+    '<div class="quiz-progress-track">'
+    '<div class="quiz-progress-fill" style="width: {width:.2f}%;"></div>'
+    "</div>"
+    '<div class="quiz-progress-label">{status}</div>'
+    "</div></div>"
+    '<div class="quiz-progress-spacer"></div>'
+)
+
 # ---------- util ----------
 
 
+@lru_cache(maxsize=2048)
 def esc(x: str) -> str:
-    """Escapa HTML cuando usamos unsafe_allow_html=True."""
+    """Escapa HTML cuando usamos unsafe_allow_html=True (memoizado: textos fijos)."""
     return html.escape(x or "", quote=True)
 
 
@@ -53,52 +71,20 @@ def _radio_for_question(q: Dict[str, Any], idx: int) -> Tuple[int, str]:
     """
     Render de una pregunta con diseño responsive mejorado.
     """
-    # Sección arriba del enunciado
-    section = q.get("section") or ""
-    if section:
-        st.markdown(
-            f"""
-            <div style="
-                display: inline-block;
-                font-size: 0.9rem;
-                color: #6b7280;
-                background: linear-gradient(135deg, #f3f4f6 0%, #e5e7eb 100%);
-                border: 1px solid #d1d5db;
-                padding: 0.4rem 0.8rem;
-                border-radius: 8px;
-                margin: 0 0 0.75rem 0;
-                font-weight: 600;
-            ">
-                {esc(section)}
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
-
-    # Enunciado responsive
-    st.markdown(
-        f"""
-        <div style="
-            font-size: clamp(1.1rem, 2.5vw, 1.4rem);
-            line-height: 1.6;
-            color: #111827;
-            background-color: #ffffff;
-            margin: 0.5rem 0 1rem 0;
-            font-weight: 700;
-            padding: 0.5rem 0;
-        ">
-            <span style="color: #667eea; font-weight: 800;">{esc(q.get('id', ''))}.</span> {esc(q.get('text', ''))}
-        </div>
-        """,
-        unsafe_allow_html=True,
-    )
+    # Un solo st.markdown por pregunta: separador de la anterior, sección arriba
+    # y enunciado (los campos *_html vienen escapados del loader)
+    header = [_DIVIDER_HTML] if idx > 0 else []
+    if q["section_html"]:
+        header.append(_SECTION_TMPL.format(q["section_html"]))
+    header.append(_QUESTION_TMPL.format(q["id_html"], q["text_html"]))
+    st.markdown("".join(header), unsafe_allow_html=True)
 
     # Opciones 3,2,1
     opts = sorted(q.get("options", []), key=lambda x: int(x["score"]), reverse=True)
-    labels = [esc(str(o.get("label", ""))) for o in opts]
+    labels = [o["label_html"] for o in opts]
 
     choice = st.radio(
-        f"Seleccione una opción para la pregunta {esc(q.get('id',''))}:",
+        f"Seleccione una opción para la pregunta {q['id_html']}:",
         options=list(range(len(opts))),
         format_func=lambda i: labels[i],
         index=None,
@@ -107,11 +93,6 @@ def _radio_for_question(q: Dict[str, Any], idx: int) -> Tuple[int, str]:
         label_visibility="collapsed",
     )
 
-    st.markdown(
-        '<div style="height: 1.5rem; border-bottom: 1px solid #e5e7eb; margin: 1rem 0;"></div>',
-        unsafe_allow_html=True,
-    )
-
     if choice is not None:
         chosen = opts[choice]
         return int(chosen.get("score", 0)), str(chosen.get("label", ""))
@@ -141,55 +122,18 @@ def build_quiz_form(
             st.warning(f"Falta responder la pregunta **{q.get('id','?')}**")
 
     # Barra de progreso con colores de la bandera LGBTI
-    if len(questions) > 0:
-        progress = completed_questions / len(questions)
-
-        # Gradiente de la bandera LGBTI
-        lgbti_gradient = "linear-gradient(to right, #E40303 0%, #FF8C00 16.67%, #FFED00 33.33%, #008026 50%, #24408E 66.67%, #732982 83.33%, #732982 100%)"
-
+    total = len(questions)
+    if total > 0:
+        status = (
+            "Completado"
+            if completed_questions == total
+            else f"Progreso: {completed_questions}/{total} preguntas · "
+            f"Faltan {total - completed_questions}"
+        )
+        width = completed_questions / total * 100
+        # El separador de la última pregunta viaja con la barra
         st.markdown(
-            f"""
-            <div style="
-                position: fixed;
-                bottom: 0;
-                left: 0;
-                right: 0;
-                background: linear-gradient(to top, #ffffff 0%, rgba(255,255,255,0.98) 100%);
-                padding: clamp(0.75rem, 2vw, 1.25rem);
-                border-top: 2px solid #e5e7eb;
-                box-shadow: 0 -4px 16px rgba(0,0,0,0.1);
-                z-index: 999;
-                backdrop-filter: blur(10px);
-            ">
-                <div style="max-width: 1200px; margin: 0 auto;">
-                    <div style="
-                        height: 14px;
-                        background-color: #e5e7eb;
-                        border-radius: 999px;
-                        overflow: hidden;
-                        box-shadow: inset 0 2px 4px rgba(0,0,0,0.1);
-                    ">
-                        <div style="
-                            height: 100%;
-                            width: {progress * 100}%;
-                            background: {lgbti_gradient};
-                            transition: width 0.4s cubic-bezier(0.4, 0.0, 0.2, 1);
-                            box-shadow: 0 0 12px rgba(0,0,0,0.15);
-                        "></div>
-                    </div>
-                    <div style="
-                        margin-top: 0.5rem;
-                        color: #374151;
-                        font-size: clamp(0.85rem, 2vw, 1rem);
-                        text-align: center;
-                        font-weight: 600;
-                    ">
-                        {'Completado' if completed_questions == len(questions) else f'Progreso: {completed_questions}/{len(questions)} preguntas · Faltan {len(questions)-completed_questions}'}
-                    </div>
-                </div>
-            </div>
-            <div style="height: clamp(70px, 15vw, 90px);"></div>
-            """,
+            _DIVIDER_HTML + _FOOTER_TMPL.format(width=width, status=status),
             unsafe_allow_html=True,
         )
 
@@ -202,7 +146,7 @@ def build_quiz_form(
 def show_result(
     result: Dict[str, Any],
     levels: Dict[str, Dict[str, str]],
-    recommendations: pd.DataFrame,
+    recommendations: Optional[pd.DataFrame],
     areas: Dict[str, int],
 ) -> None:
     # Encabezado responsive y centrado